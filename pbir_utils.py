@@ -2,38 +2,436 @@ import csv
 import json
 import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to ujson, then to the standard library json module
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+METADATA_FIELDNAMES = ['Report', 'Page', 'Table', 'Column or Measure', 'Expression', 'Used In']
+
+# Matches table[column], 'table'[column], or 'table name'[column]; table names may contain any word characters
+_COLUMN_REF_PATTERN = r"(?P<ref_table>'[\w ]+'?|\w+)\[(?P<column>[A-Za-z0-9_]+)\]"
+_COLUMN_RE = re.compile(_COLUMN_REF_PATTERN)
+# Column references first, then quoted and unquoted table names, avoiding those inside square brackets
+_DAX_RE = re.compile(
+    _COLUMN_REF_PATTERN
+    + r"|(?<!\[)(?P<quotes>'+)(?P<quoted_table>\b[\w\s]+?\b)(?P=quotes)"
+    + r"|\b(?P<table>\w+)\b(?!\])"
+)
+# Names the generic patterns can match as a bare table and as a column respectively
+_BARE_TABLE_NAME_RE = re.compile(r"\w+")
+_COLUMN_NAME_RE = re.compile(r"[A-Za-z0-9_]+")
+# Digit runs long enough to be an integer outside the 64-bit range
+_LONG_INTEGER_RE = re.compile(rb"\d{19}")
+# Characters JSON writers do not escape, so names can be searched for in the raw file bytes
+_LITERAL_RUN_RE = re.compile(r"[A-Za-z0-9_ ]+")
+# Innermost bracketed tokens, such as the "[column]" part of a column reference
+_BRACKETED_RE = re.compile(r"\[[^\[\]]*\]")
+
+# Keys that update_pbir_references acts on; every other value is only descended into
+_UPDATE_KEYS = frozenset({"Entity", "entities", "expression", "Column", "Measure", "filter"})
+
+# Number of files handed to a worker process at a time
+_POOL_CHUNKSIZE = 16
+# Largest worker count ProcessPoolExecutor accepts on Windows
+_WINDOWS_MAX_WORKERS = 61
+
+# Maximum number of DAX expressions remembered by a rewriter from build_dax_rewriter
+_DAX_CACHE_SIZE = 65536
+
+# Arguments for update_pbir_component in the current process, set by init_update_worker
+_update_worker_arguments = {}
+
+
+def load_json_file(file_path):
+    """
+    Load a JSON file, using orjson or ujson when one of them is installed (see parse_json).
+    
+    The file is read in binary mode with a single read call and parsed from bytes, instead of
+    letting the parser pull text through the default 8 KiB buffer.
+    
+    Parameters:
+    - file_path: Path to the JSON file.
+    
+    Returns:
+    - The parsed JSON data.
+    """
+    with open(file_path, 'rb') as json_file:
+        return parse_json(json_file.read())
+
+
+def parse_json(raw):
+    """
+    Parse JSON from bytes, using orjson or ujson when one of them is installed.
+    
+    Parameters:
+    - raw: The UTF-8 encoded JSON document.
+    
+    Returns:
+    - The parsed JSON data.
+    
+    Raises:
+    - ValueError: If the document is not valid JSON (the parsers raise different ValueError subclasses).
+    """
+    if orjson:
+        return orjson.loads(raw)
+    if ujson:
+        return ujson.loads(raw)
+    return json.loads(raw)
+
+
+def serialize_json(data):
+    """
+    Serialize JSON data to bytes with a 2-space indent, using orjson or ujson when one of them is installed.
+    Data they cannot serialize, such as integers wider than 64 bits, is handled by the standard library.
+    
+    Parameters:
+    - data: The JSON data to serialize.
+    
+    Returns:
+    - The UTF-8 encoded JSON document.
+    """
+    try:
+        if orjson:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        if ujson:
+            return ujson.dumps(data, indent=2, ensure_ascii=False, escape_forward_slashes=False).encode('utf-8')
+    except (TypeError, OverflowError):
+        pass
+    # Serialize up front so the file is written at once; json.dump would issue many small writes
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def replace_file_contents(file_path, raw):
+    """
+    Replace the contents of a file by writing a temporary file next to it and renaming it over the original,
+    so the file is never left partially written.
+    
+    Parameters:
+    - file_path: Path to the file.
+    - raw: The new contents as bytes.
+    """
+    temp_path = file_path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as temp_file:
+            temp_file.write(raw)
+        os.replace(temp_path, file_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def find_json_files(directory_path):
+    """
+    Collect the paths of all JSON files under a directory, in the same order as os.walk.
+    
+    Uses os.scandir directly so the file type checks come from the cached directory entries.
+    
+    Parameters:
+    - directory_path: Path to the root directory to search.
+    
+    Returns:
+    - A list of JSON file paths.
+    """
+    json_files = []
+    subdirectories = []
+    try:
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                elif entry.name.endswith('.json'):
+                    json_files.append(entry.path)
+    except OSError:
+        # Unreadable directories are skipped, as os.walk does
+        return json_files
+    for subdirectory in subdirectories:
+        json_files.extend(find_json_files(subdirectory))
+    return json_files
+
+
+def map_json_files(func, file_paths, max_workers=None, initializer=None, initargs=()):
+    """
+    Apply a function to each JSON file, spreading the files across worker processes.
+    
+    Parameters:
+    - func: A picklable function taking a file path.
+    - file_paths: The JSON file paths to process.
+    - max_workers: Maximum number of worker processes (defaults to the CPU count). Use 1 to process the
+      files sequentially in the current process, which also happens when there are too few files to split.
+    - initializer: Optional picklable function called once in each process that runs func, before any file.
+      func is sent to the workers again with every chunk of files, so state shared by all files should
+      be installed by the initializer instead of being bound into func.
+    - initargs: Arguments for initializer.
+    
+    Returns:
+    - A list of results in the same order as file_paths.
+    """
+    # Workers receive the files in chunks, so extra workers beyond the number of chunks would
+    # only add process start-up cost; a single chunk is processed in the current process
+    chunk_count = -(-len(file_paths) // _POOL_CHUNKSIZE)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+        if sys.platform == 'win32':
+            # ProcessPoolExecutor rejects more workers than this on Windows
+            max_workers = min(max_workers, _WINDOWS_MAX_WORKERS)
+    max_workers = min(max_workers, chunk_count)
+    if max_workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [func(file_path) for file_path in file_paths]
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=initializer, initargs=initargs) as executor:
+        return list(executor.map(func, file_paths, chunksize=_POOL_CHUNKSIZE))
 
 
 def load_csv_mapping(csv_path):
     """
-    Load a CSV file and return a list of dictionaries mapping from old (entity, column) pairs
+    Load a CSV file and return a list of tuples mapping from old (entity, column) pairs
     to new (entity, column) pairs, filtering out invalid rows based on specified conditions.
     
     Parameters:
     - csv_path: Path to the CSV file.
     
     Returns:
-    - A list of dictionaries with keys as 'old_tbl', 'old_col', 'new_tbl', 'new_col'.
+    - A list of (old_tbl, old_col, new_tbl, new_col) tuples.
     """
     mappings = []
     with open(csv_path, 'r', newline='', encoding='utf-8-sig') as csvfile:
-        reader = csv.DictReader(csvfile)
+        reader = csv.reader(csvfile)
         expected_columns = ['old_tbl', 'old_col', 'new_tbl', 'new_col']
         # Strip BOM from the column names if present
-        fieldnames = [name.lstrip('\ufeff') for name in reader.fieldnames]
+        fieldnames = [name.lstrip('\ufeff') for name in next(reader, [])]
         if not all(col in fieldnames for col in expected_columns):
             raise ValueError(f"CSV file must contain the following columns: {', '.join(expected_columns)}")
+        indices = [fieldnames.index(col) for col in expected_columns]
         for row in reader:
-            old_tbl, old_col, new_tbl, new_col = row['old_tbl'], row['old_col'], row['new_tbl'], row['new_col']
+            # Pad short rows so missing trailing fields read as empty
+            row += [''] * (len(fieldnames) - len(row))
+            mapping = tuple([row[i] for i in indices])
+            old_tbl, old_col, new_tbl, new_col = mapping
             if old_tbl and (new_tbl or (old_col and new_col)):
-                mappings.append(row)
+                mappings.append(mapping)
     return mappings
 
 
+def build_dax_pattern(table_map=None, column_map=None):
+    """
+    Build a regex that only matches DAX references affected by the given mappings.
+    
+    The generic pattern matches every identifier and leaves the map lookup to the replacement
+    callback; this one spells the mapped table and column names out as alternations, so the
+    callback only runs on real candidates. Quoted table names are still matched generically so
+    that a mapped name is never rewritten inside a longer quoted name; they are far less common
+    than bare identifiers.
+    
+    Parameters:
+    - table_map: A dictionary mapping old table names to new table names.
+    - column_map: A dictionary mapping old (table, column) pairs to new column names.
+    
+    Returns:
+    - A compiled pattern for replace_dax_reference, or None if there is nothing to match.
+    """
+    def alternation(names):
+        return "|".join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+
+    # Only names the generic pattern could match can ever be rewritten
+    bare_tables = alternation(name for name in table_map or () if _BARE_TABLE_NAME_RE.fullmatch(name))
+    columns = alternation({column for _, column in column_map or () if _COLUMN_NAME_RE.fullmatch(column)})
+
+    ref_tables = []
+    if table_map:
+        # Quoted references are matched generically, as with quoted table names below
+        ref_tables.append(r"'[\w ]+'?")
+    elif columns:
+        ref_tables.append(rf"'[\w ]+'?(?=\[(?:{columns})\])")
+    if columns:
+        ref_tables.append(rf"\b\w+(?=\[(?:{columns})\])")
+    if bare_tables:
+        ref_tables.append(rf"\b(?:{bare_tables})")
+    if not ref_tables:
+        return None
+
+    alternatives = [rf"(?P<ref_table>{'|'.join(ref_tables)})\[(?P<column>[A-Za-z0-9_]+)\]"]
+    if table_map:
+        alternatives.append(r"(?<!\[)(?P<quotes>'+)(?P<quoted_table>\b[\w\s]+?\b)(?P=quotes)")
+    if bare_tables:
+        alternatives.append(rf"\b(?P<table>{bare_tables})\b(?!\])")
+    return re.compile("|".join(alternatives))
+
+
+def replace_dax_reference(table_map, column_map, match):
+    """
+    Replacement callback for the DAX patterns: rewrite one matched table or column reference.
+    
+    Parameters:
+    - table_map: A dictionary mapping old table names to new table names.
+    - column_map: A dictionary mapping old (table, column) pairs to new column names.
+    - match: The regex match of a column reference, quoted table name or bare table name.
+    
+    Returns:
+    - The replacement text.
+    """
+    # The alternatives end in different groups, so the last matched group tells them apart
+    kind = match.lastgroup
+    if kind == "column":
+        table_part, column_name = match.group("ref_table", "column")
+        # Remove quotes from table name for lookup
+        table_name = table_part.strip("'")
+        new_table = table_map.get(table_name, table_name)
+        new_column = column_map.get((new_table, column_name), column_name)
+        if new_table == table_name and new_column == column_name:
+            return match.group(0)
+        # Preserve original quoting style if no spaces in the table name
+        if ' ' in new_table or table_part.startswith("'"):
+            new_table = f"'{new_table}'"
+        return f"{new_table}[{new_column}]"
+
+    if kind == "quoted_table":
+        quotes, table_name = match.group("quotes", "quoted_table")
+    else:
+        quotes, table_name = '', match.group("table")
+    if table_name in table_map:
+        new_table = table_map[table_name]
+        if ' ' in new_table and not quotes:
+            return f"'{new_table}'"
+        return f"{quotes}{new_table}{quotes}"
+    return match.group(0)
+
+
+def build_dax_rewriter(table_map=None, column_map=None):
+    """
+    Build a function that rewrites DAX expressions for a fixed pair of mappings.
+    
+    The pattern specialised to the mapped names is compiled once and bound together with the
+    replacement callback and the substring prefilter, so no per-expression setup is needed.
+    The prefilter keeps the column renames grouped by table, so a common column name only lets
+    an expression through when one of the tables it is renamed for occurs as well. Results are
+    memoized, as the same expressions recur across the visuals and bookmarks of a report.
+    The result is built from partials and can be sent to worker processes; each copy keeps its
+    own memo, so install it once per process (see init_update_worker) rather than per task.
+    
+    Parameters:
+    - table_map: A dictionary mapping old table names to new table names.
+    - column_map: A dictionary mapping old (table, column) pairs to new column names.
+    
+    Returns:
+    - A function taking a DAX expression and returning the updated expression, or None if
+      the mappings cannot affect any expression.
+    """
+    pattern = build_dax_pattern(table_map, column_map)
+    if pattern is None:
+        return None
+    table_map = table_map or {}
+    column_map = column_map or {}
+    # Every rewrite needs a mapped table name somewhere in the expression, or a "[column]" token
+    # together with an unrenamed table the column is mapped for (renamed tables are covered by
+    # the table names)
+    tables_by_column = {}
+    for table, column in column_map:
+        if table not in table_map:
+            tables_by_column.setdefault(f"[{column}]", []).append(table)
+    tables_by_column = {column: tuple(tables) for column, tables in tables_by_column.items()}
+    replace = partial(replace_dax_reference, table_map, column_map)
+
+    # Precompute the replacement text of every literal reference the mappings define, so most
+    # matches are resolved with a single dict lookup instead of inspecting the match groups
+    literals = set()
+    for table in table_map:
+        literals.update((table, f"'{table}'"))
+    for table, column in column_map:
+        source_tables = [old for old, new in table_map.items() if new == table]
+        if table not in table_map:
+            source_tables.append(table)
+        for source_table in source_tables:
+            literals.update((f"{source_table}[{column}]", f"'{source_table}'[{column}]"))
+    replacements = {}
+    for literal in literals:
+        match = pattern.fullmatch(literal)
+        if match:
+            replacements[literal] = replace(match)
+    if replacements:
+        replace = partial(replace_dax_literal, replacements, replace)
+    rewrite = partial(rewrite_dax_expression, pattern, replace, tuple(table_map), tables_by_column)
+    return partial(rewrite_dax_expression_cached, {}, rewrite)
+
+
+def rewrite_dax_expression_cached(cache, rewrite, expression):
+    """
+    Rewrite a DAX expression, reusing the result for expressions that were rewritten before.
+    
+    Parameters:
+    - cache: A dictionary mapping expressions to their rewritten form; cleared when it is full.
+    - rewrite: The function rewriting an expression that is not cached.
+    - expression: The DAX expression to update.
+    
+    Returns:
+    - Updated DAX expression.
+    """
+    new_expression = cache.get(expression)
+    if new_expression is None:
+        if len(cache) >= _DAX_CACHE_SIZE:
+            cache.clear()
+        new_expression = cache[expression] = rewrite(expression)
+    return new_expression
+
+
+def replace_dax_literal(replacements, replace, match):
+    """
+    Replacement callback that looks the matched text up in precomputed replacements first.
+    
+    Parameters:
+    - replacements: A dictionary mapping matched reference text to its replacement.
+    - replace: The general replacement callback for text not in replacements.
+    - match: The regex match.
+    
+    Returns:
+    - The replacement text.
+    """
+    return replacements.get(match.group(0)) or replace(match)
+
+
+def rewrite_dax_expression(pattern, replace, table_names, tables_by_column, expression):
+    """
+    Rewrite a DAX expression with a prepared pattern, skipping the regex when no mapped reference can occur.
+    
+    Parameters:
+    - pattern: The compiled pattern from build_dax_pattern.
+    - replace: The replacement callback for pattern.sub.
+    - table_names: The renamed table names.
+    - tables_by_column: A dictionary mapping "[column]" tokens to the unrenamed tables the column is renamed for.
+    - expression: The DAX expression to update.
+    
+    Returns:
+    - Updated DAX expression.
+    """
+    if any(table in expression for table in table_names):
+        return pattern.sub(replace, expression)
+    # Look the bracketed tokens up instead of searching for every mapped column
+    for column in _BRACKETED_RE.findall(expression):
+        tables = tables_by_column.get(column)
+        if tables and any(table in expression for table in tables):
+            return pattern.sub(replace, expression)
+    return expression
+
+
 def update_dax_expression(expression, table_map=None, column_map=None):
     """
     Update DAX expressions based on table_map and/or column_map.
     
+    Table names in column references may contain any word characters, as bare table names always
+    could, so columns are also renamed under non-ASCII table names such as Café[Amount]. Column
+    names themselves are still matched as ASCII letters, digits and underscores.
+    
     Parameters:
     - expression: The DAX expression to update.
     - table_map: A dictionary mapping old table names to new table names.
@@ -42,90 +440,145 @@ def update_dax_expression(expression, table_map=None, column_map=None):
     Returns:
     - Updated DAX expression.
     """
-    if table_map:
-        def replace_table_name(match):
-            full_match = match.group(0)
-            quotes = match.group(1) or ''
-            table_name = match.group(2) or match.group(3)  # Group 2 for quoted, Group 3 for unquoted
-            
-            if table_name in table_map:
-                new_table = table_map[table_name]
-                if ' ' in new_table and not quotes:
-                    return f"'{new_table}'"
-                return f"{quotes}{new_table}{quotes}"
-            return full_match
-
-        # Updated pattern to match both quoted and unquoted table names, avoiding those inside square brackets
-        pattern = re.compile(r"(?<!\[)('+)?(\b[\w\s]+?\b)\1|\b([\w]+)\b(?!\])")
-        expression = pattern.sub(replace_table_name, expression)
-
-    if column_map:
-        def replace_column_name(match):
-            full_match = match.group(0)
-            table_part = match.group(1)
-            column_name = match.group(2)
-            
-            # Remove quotes from table name for lookup
-            table_name = table_part.strip("'")
-            
-            if (table_name, column_name) in column_map:
-                new_column = column_map[(table_name, column_name)]
-                # Preserve original quoting style if no spaces in new table name
-                if ' ' in table_name or table_part.startswith("'"):
-                    table_part = f"'{table_name}'"
-                else:
-                    table_part = table_name
-                return f"{table_part}[{new_column}]"
-            return full_match
+    # Cheap substring checks first: skip the regex passes when no mapped name can match
+    if table_map and not any(table in expression for table in table_map):
+        table_map = None
+    if column_map and not any(f"[{column}]" in expression for _, column in column_map):
+        column_map = None
 
-        # Pattern to match table[column], 'table'[column], or 'table name'[column]
-        pattern = re.compile(r"('[A-Za-z0-9_ ]+'?|[A-Za-z0-9_]+)\[([A-Za-z0-9_]+)\]")
-        expression = pattern.sub(replace_column_name, expression)
+    if not table_map and not column_map:
+        return expression
 
-    return expression
+    # Table renames need the full pattern; column renames alone only need column references
+    pattern = _DAX_RE if table_map else _COLUMN_RE
+    return pattern.sub(partial(replace_dax_reference, table_map or {}, column_map or {}), expression)
 
 
-def update_entity(data, table_map):
+def update_pbir_references(data, table_map=None, column_map=None, dax_rewriter=None):
     """
-    Update the "Entity" fields and DAX expressions in the JSON data based on the table_map.
+    Update table and column references in the JSON data in a single traversal.
+    
+    Table renames are applied to "Entity" fields, entity names and DAX expressions; column renames
+    are applied to "Column"/"Measure" properties, filter conditions and DAX expressions. Column
+    lookups use the renamed table, so the result matches applying the table_map first.
     
     Parameters:
     - data: The JSON data to update.
     - table_map: A dictionary mapping old table names to new table names.
+    - column_map: A dictionary mapping old (table, column) pairs to new column names.
+    - dax_rewriter: Optional function from build_dax_rewriter for the same maps, used for DAX expressions.
     
     Returns:
     - True if any updates were made, False otherwise.
     """
+    if not table_map and not column_map:
+        return False
+    table_map = table_map or {}
+    column_map = column_map or {}
+    if dax_rewriter is None:
+        dax_rewriter = partial(update_dax_expression, table_map=table_map, column_map=column_map)
     updated = False
-
-    def traverse_and_update(data):
-        nonlocal updated
-        if isinstance(data, dict):
-            for key, value in data.items():
-                if key == "Entity" and value in table_map:
-                    data[key] = table_map[value]
-                    updated = True
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        # JSON data holds plain dicts and lists, so exact type checks are enough (and faster than isinstance)
+        node_type = type(node)
+        if node_type is dict:
+            for key, value in node.items():
+                if key not in _UPDATE_KEYS:
+                    # Scalars are dropped when popped, so no type check is needed here
+                    stack.append(value)
+                elif key == "Entity":
+                    if type(value) is str and value in table_map:
+                        node[key] = table_map[value]
+                        updated = True
                 elif key == "entities":
+                    # Entities (report-level measures) have a fixed shape: a table name and measures
+                    # with DAX expressions, so their fields are accessed directly instead of walked
+                    if type(value) is not list:
+                        stack.append(value)
+                        continue
                     for entity in value:
-                        if "name" in entity and entity["name"] in table_map:
-                            entity["name"] = table_map[entity["name"]]
+                        if type(entity) is not dict:
+                            stack.append(entity)
+                            continue
+                        name = entity.get("name")
+                        if type(name) is str and name in table_map:
+                            entity["name"] = table_map[name]
                             updated = True
-                        traverse_and_update(entity)
-                elif key == "expression" and isinstance(value, str):
-                    original_expression = value
-                    data[key] = update_dax_expression(original_expression, table_map=table_map)
-                    if data[key] != original_expression:
-                        updated = True
+                        measures = entity.get("measures")
+                        items = [entity, *measures] if type(measures) is list else [entity]
+                        for item in items:
+                            expression = item.get("expression") if type(item) is dict else None
+                            if type(expression) is str:
+                                new_expression = dax_rewriter(expression)
+                                if new_expression != expression:
+                                    item["expression"] = new_expression
+                                    updated = True
+                elif key == "expression":
+                    if type(value) is str:
+                        new_expression = dax_rewriter(value)
+                        if new_expression != value:
+                            node[key] = new_expression
+                            updated = True
+                    else:
+                        stack.append(value)
+                elif type(value) is not dict:
+                    stack.append(value)
+                elif key == "filter":
+                    if column_map and type(value.get("From")) is list and type(value.get("Where")) is list:
+                        # Conditions refer to their table through a "From" alias; sources without an
+                        # entity, such as the subquery of a TopN filter, are left to the generic walk
+                        sources = {}
+                        for source in value["From"]:
+                            if type(source) is dict and type(source.get("Name")) is str and type(source.get("Entity")) is str:
+                                sources[source["Name"]] = table_map.get(source["Entity"], source["Entity"])
+                        for condition in value["Where"]:
+                            # Conditions usually have this shape, so index directly and skip the others
+                            try:
+                                column = condition["Condition"]["Not"]["Expression"]["In"]["Expressions"][0]["Column"]
+                                property = column["Property"]
+                                from_entity = sources[column["Expression"]["SourceRef"]["Source"]]
+                            except (KeyError, IndexError, TypeError):
+                                continue
+                            if property and (from_entity, property) in column_map:
+                                new_property = column_map[(from_entity, property)]
+                                if new_property != property:
+                                    column["Property"] = new_property
+                                    updated = True
+                    stack.append(value)
                 else:
-                    traverse_and_update(value)
-        elif isinstance(data, list):
-            for item in data:
-                traverse_and_update(item)
+                    # "Column" or "Measure" field reference
+                    entity = value.get("Expression", {}).get("SourceRef", {}).get("Entity")
+                    property = value.get("Property")
+                    if entity and property:
+                        entity = table_map.get(entity, entity)
+                        if (entity, property) in column_map:
+                            new_property = column_map[(entity, property)]
+                            if new_property != property:
+                                value["Property"] = new_property
+                                updated = True
+                    stack.append(value)
+        elif node_type is list:
+            stack.extend(node)
 
-    traverse_and_update(data)
     return updated
 
 
+def update_entity(data, table_map):
+    """
+    Update the "Entity" fields and DAX expressions in the JSON data based on the table_map.
+    
+    Parameters:
+    - data: The JSON data to update.
+    - table_map: A dictionary mapping old table names to new table names.
+    
+    Returns:
+    - True if any updates were made, False otherwise.
+    """
+    return update_pbir_references(data, table_map=table_map)
+
+
 def update_property(data, column_map):
     """
     Update the "Property" fields in the JSON data based on the column_map and updated table names.
@@ -133,54 +586,37 @@ def update_property(data, column_map):
     Parameters:
     - data: The JSON data to update.
     - column_map: A dictionary mapping old (table, column) pairs to new (table, column) pairs.
-    - table_map: A dictionary mapping old table names to new table names.
     
     Returns:
     - True if any updates were made, False otherwise.
     """
-    updated = False
+    return update_pbir_references(data, column_map=column_map)
 
-    def traverse_and_update(data):
-        nonlocal updated
-        if isinstance(data, dict):
-            for key, value in data.items():
-                if key in ["Column", "Measure"]:
-                    entity = value.get("Expression", {}).get("SourceRef", {}).get("Entity")
-                    property = value.get("Property")
-                    if entity and property:
-                        if (entity, property) in column_map:
-                            new_property = column_map[(entity, property)]
-                            value["Expression"]["SourceRef"]["Entity"] = entity
-                            value["Property"] = new_property
-                            updated = True
-                elif key == "expression" and isinstance(value, str):
-                    original_expression = value
-                    value = update_dax_expression(original_expression, column_map=column_map)
-                    if value != original_expression:
-                        data[key] = value
-                        updated = True
-                elif key == "filter":
-                    if "From" in value and "Where" in value:
-                        from_entity = value["From"][0]["Entity"]
-                        for condition in value["Where"]:
-                            column = condition.get("Condition", {}).get("Not", {}).get("Expression", {}).get("In", {}).get("Expressions", [{}])[0].get("Column", {})
-                            property = column.get("Property")
-                            if property:
-                                if (from_entity, property) in column_map:
-                                    new_property = column_map[(from_entity, property)]
-                                    column["Property"] = new_property
-                                    updated = True
-                else:
-                    traverse_and_update(value)
-        elif isinstance(data, list):
-            for item in data:
-                traverse_and_update(item)
 
-    traverse_and_update(data)
-    return updated
+def build_search_terms(table_map, column_map):
+    """
+    Build the byte strings that must occur in a PBIR component file for any mapping to apply to it.
+    
+    JSON writers may escape any character of a string (\u00E9 or \u00e9 for é, \u0026 for &, \/ for /),
+    so each name is searched for by its longest run of ASCII letters, digits, underscores and spaces,
+    which are always written literally. A name without such characters yields the empty byte string,
+    which occurs in every file, so those files are always parsed.
+    
+    Parameters:
+    - table_map: A dictionary mapping old table names to new table names.
+    - column_map: A dictionary mapping old (table, column) pairs to new column names.
+    
+    Returns:
+    - A tuple of byte strings.
+    """
+    names = set(table_map or ()) | {column for _, column in column_map or ()}
+    terms = set()
+    for name in names:
+        terms.add(max(_LITERAL_RUN_RE.findall(name), key=len, default='').encode('ascii'))
+    return tuple(terms)
 
 
-def update_pbir_component(file_path, table_map, column_map):
+def update_pbir_component(file_path, table_map, column_map, search_terms=None, dax_rewriter=None):
     """
     Update a single component within a Power BI Enhanced Report Format (PBIR) structure.
     
@@ -191,34 +627,63 @@ def update_pbir_component(file_path, table_map, column_map):
     - file_path: Path to the PBIR component JSON file.
     - table_map: A dictionary mapping old table names to new table names.
     - column_map: A dictionary mapping old (table, column) pairs to new column names.
+    - search_terms: Optional byte strings from build_search_terms; files containing none of them are skipped
+      without being parsed. Built from the mappings when not provided.
+    - dax_rewriter: Optional function from build_dax_rewriter, used to rewrite DAX expressions.
     """
+    if search_terms is None:
+        search_terms = build_search_terms(table_map, column_map)
     try:
-        with open(file_path, 'r', encoding='utf-8') as json_file:
-            data = json.load(json_file)
-        
-        entity_updated = False
-        property_updated = False
-
-        if table_map:
-            entity_updated = update_entity(data, table_map)
-            if entity_updated:
-                print(f"Entity updated in file: {file_path}")
-
-        if column_map:
-            property_updated = update_property(data, column_map)
-            if property_updated:
-                print(f"Property updated in file: {file_path}")
-
-        if entity_updated or property_updated:
-            with open(file_path, 'w', encoding='utf-8') as json_file:
-                json.dump(data, json_file, indent=2)
-    except json.JSONDecodeError:
+        with open(file_path, 'rb') as json_file:
+            raw = json_file.read()
+        if not any(term in raw for term in search_terms):
+            return
+        data = parse_json(raw)
+
+        if update_pbir_references(data, table_map, column_map, dax_rewriter):
+            if (orjson or ujson) and _LONG_INTEGER_RE.search(raw):
+                # The fast parsers may turn integers wider than 64 bits into floats; redo the update
+                # on the standard library's exact parse so they are written back unchanged
+                data = json.loads(raw)
+                update_pbir_references(data, table_map, column_map, dax_rewriter)
+            new_raw = serialize_json(data)
+            # Rewriting a file in the same formatting would only touch its modification time
+            if new_raw != raw:
+                print(f"References updated in file: {file_path}")
+                replace_file_contents(file_path, new_raw)
+    except ValueError:
         print(f"Error: Unable to parse JSON in file: {file_path}")
     except IOError as e:
         print(f"Error: Unable to read or write file: {file_path}. {str(e)}")
 
 
-def batch_update_pbir_project(directory_path, csv_path):
+def init_update_worker(table_map, column_map, search_terms=None, dax_rewriter=None):
+    """
+    Store the arguments that update_pbir_component_in_worker passes to update_pbir_component
+    in the current process. Used as the process pool initializer in batch_update_pbir_project.
+    
+    Parameters:
+    - table_map: A dictionary mapping old table names to new table names.
+    - column_map: A dictionary mapping old (table, column) pairs to new column names.
+    - search_terms: Optional byte strings from build_search_terms.
+    - dax_rewriter: Optional function from build_dax_rewriter.
+    """
+    _update_worker_arguments.clear()
+    _update_worker_arguments.update(table_map=table_map, column_map=column_map,
+                                    search_terms=search_terms, dax_rewriter=dax_rewriter)
+
+
+def update_pbir_component_in_worker(file_path):
+    """
+    Update a single PBIR component with the arguments stored by init_update_worker.
+    
+    Parameters:
+    - file_path: Path to the PBIR component JSON file.
+    """
+    update_pbir_component(file_path, **_update_worker_arguments)
+
+
+def batch_update_pbir_project(directory_path, csv_path, max_workers=None):
     """
     Perform a batch update on all components of a Power BI Enhanced Report Format (PBIR) project.
     
@@ -229,28 +694,41 @@ def batch_update_pbir_project(directory_path, csv_path):
     Parameters:
     - directory_path: Path to the root directory of the PBIR project (usually the 'definition' folder).
     - csv_path: Path to the CSV file with the mapping of old and new table/column names.
+    - max_workers: Number of worker processes used to update files (defaults to the CPU count, 1 runs sequentially).
     """
     try:
         mappings = load_csv_mapping(csv_path)
         
+        # Names recur throughout the maps and the updated JSON, so share a single string object per name
+        mappings = [tuple(map(sys.intern, mapping)) for mapping in mappings]
+        
         table_map = {}
         column_map = {}
         
-        for row in mappings:
-            old_tbl, old_col, new_tbl, new_col = row['old_tbl'], row['old_col'], row['new_tbl'], row['new_col']
+        for old_tbl, _, new_tbl, _ in mappings:
             if new_tbl and new_tbl != old_tbl:
                 table_map[old_tbl] = new_tbl
+        # Key the column renames by the renamed table once all table renames are known, so the
+        # result does not depend on the order of the rows
+        for old_tbl, old_col, _, new_col in mappings:
             if old_col and new_col:
                 effective_tbl = table_map.get(old_tbl, old_tbl)
                 column_map[(effective_tbl, old_col)] = new_col
+        search_terms = build_search_terms(table_map, column_map)
+        if not search_terms:
+            # No file can contain a name from an empty mapping, so there is nothing to read
+            print("No table or column renames found in the mapping file.")
+            return
+        dax_rewriter = build_dax_rewriter(table_map, column_map)
         
-        for root, _, files in os.walk(directory_path):
-            for file in files:
-                if file.endswith('.json'):
-                    file_path = os.path.join(root, file)
-                    update_pbir_component(file_path, table_map, column_map)
+        # Install the mappings once per process rather than sending them with every chunk of files,
+        # which also keeps the rewriter's memoized expressions for the whole run
+        map_json_files(update_pbir_component_in_worker, find_json_files(directory_path), max_workers,
+                       initializer=init_update_worker, initargs=(table_map, column_map, search_terms, dax_rewriter))
     except Exception as e:
         print(f"An error occurred: {str(e)}")
+    finally:
+        _update_worker_arguments.clear()
 
 
 def extract_report_name(json_file_path):
@@ -279,9 +757,8 @@ def extract_active_section(bookmark_json_path):
     """
     if "bookmarks" in bookmark_json_path:
         try:
-            with open(bookmark_json_path, 'r', encoding='utf-8') as file:
-                return json.load(file).get("explorationState", {}).get("activeSection", "")
-        except (IOError, json.JSONDecodeError):
+            return load_json_file(bookmark_json_path).get("explorationState", {}).get("activeSection", "")
+        except (IOError, ValueError):
             return ""
     else:
         parts = bookmark_json_path.split(os.sep)
@@ -303,25 +780,44 @@ def extract_page_name(json_path):
         return "NA"
     base_path = json_path.split("definition")[0]
     page_json_path = os.path.join(base_path, "definition", "pages", active_section, "page.json")
+    return extract_page_display_name(os.path.abspath(page_json_path))
+
+
+@lru_cache(maxsize=None)
+def extract_page_display_name(page_json_path):
+    """
+    Extracts the display name from a page.json file.
+
+    Results are cached per path, since every visual and bookmark of a page resolves to the same page.json.
+
+    Args:
+        page_json_path (str): The absolute file path to the page.json file.
+
+    Returns:
+        str: The page display name if found, otherwise "NA".
+    """
     try:
-        with open(page_json_path, "r", encoding='utf-8') as file:
-            return json.load(file).get("displayName", "NA")
-    except (IOError, json.JSONDecodeError):
+        return load_json_file(page_json_path).get("displayName", "NA")
+    except (IOError, ValueError):
         return "NA"
 
 
-def traverse_pbir_json_structure(data, context=None):
+def traverse_pbir_json_structure(data, context=None, sources=None):
     """
-    Recursively traverses the Power BI Enhanced Report Format (PBIR) JSON structure to extract specific metadata.
+    Traverses the Power BI Enhanced Report Format (PBIR) JSON structure to extract specific metadata.
 
     This function navigates through the complex PBIR JSON structure, identifying and extracting
     key metadata elements such as entities, properties, visuals, filters, bookmarks, and measures.
     It handles various PBIR-specific components and contexts, providing a comprehensive
     extraction of report structure and data model information.
 
+    A column or measure reference ({"Expression": {"SourceRef": ...}, "Property": ...}) is emitted as a
+    single record. References through a query alias ("Source") are resolved against the enclosing "From" list.
+
     Args:
         data (dict or list): The PBIR JSON data to traverse.
         context (str, optional): The current context within the PBIR structure (e.g., visual type, filter, bookmark).
+        sources (dict, optional): Query aliases in scope, mapping each "From" name to its entity.
 
     Yields:
         tuple: Extracted metadata in the form of (table, column, context, expression).
@@ -330,33 +826,121 @@ def traverse_pbir_json_structure(data, context=None):
                - context: The context in which the element is used (e.g., visual type, filter, bookmark)
                - expression: The DAX expression for measures (if applicable)
     """
-    if isinstance(data, dict):
-        for key, value in data.items():
-            if key == "Entity":
-                yield (value, None, context, None)
-            elif key == "Property":
-                yield (None, value, context, None)
-            elif key == "visual":
-                yield from traverse_pbir_json_structure(value, value.get("visualType", "visual"))
-            elif key == "pageBinding":
-                yield from traverse_pbir_json_structure(value, value.get("type", "Drillthrough"))
-            elif key == "filterConfig":
-                yield from traverse_pbir_json_structure(value, "Filters")
-            elif key == "explorationState":
-                yield from traverse_pbir_json_structure(value, "Bookmarks")
-            elif key == "entities":
-                for entity in value:
-                    table_name = entity.get("name")
-                    for measure in entity.get("measures", []):
-                        yield (table_name, measure.get("name"), context, measure.get("expression", None))
+    # Iterative pre-order walk; children are pushed in reverse so records come out in document order
+    stack = [(data, context, sources)]
+    while stack:
+        node, context, sources = stack.pop()
+        node_type = type(node)
+        if node_type is dict:
+            if type(node.get("From")) is list:
+                sources = dict(sources or {})
+                sources.update((source.get("Name"), source.get("Entity")) for source in node["From"] if isinstance(source, dict))
+            if "Property" in node and isinstance(node.get("Expression"), dict):
+                source_ref = node["Expression"].get("SourceRef")
+                if isinstance(source_ref, dict):
+                    table = source_ref.get("Entity") or (sources or {}).get(source_ref.get("Source"))
+                    if table:
+                        yield (table, node["Property"], context, None)
+            children = []
+            for key, value in node.items():
+                if key == "visual":
+                    children.append((value, value.get("visualType", "visual"), sources))
+                elif key == "pageBinding":
+                    children.append((value, value.get("type", "Drillthrough"), sources))
+                elif key == "filterConfig":
+                    children.append((value, "Filters", sources))
+                elif key == "explorationState":
+                    children.append((value, "Bookmarks", sources))
+                elif key == "entities":
+                    # Measure records are queued as a tuple, a type that never occurs in parsed JSON
+                    children.append((tuple(
+                        (entity.get("name"), measure.get("name"), context, measure.get("expression", None))
+                        for entity in value for measure in entity.get("measures", [])
+                    ), context, sources))
+                elif type(value) is dict or type(value) is list:
+                    children.append((value, context, sources))
+            stack.extend(reversed(children))
+        elif node_type is list:
+            stack.extend((item, context, sources) for item in reversed(node)
+                         if type(item) is dict or type(item) is list)
+        elif node_type is tuple:
+            yield from node
+
+
+def extract_pbir_file_metadata(json_file_path):
+    """
+    Extracts the metadata rows from a single Power BI Enhanced Report Format (PBIR) component file.
+
+    Measures (which carry a DAX expression) are returned separately from the usage rows so they can be joined later.
+    Duplicate rows within the file are dropped.
+
+    Args:
+        json_file_path (str): The file path to the PBIR component JSON file.
+
+    Returns:
+        tuple: (usage_rows, measure_rows) where usage_rows are (report, page, table, column, used_in) tuples
+            and measure_rows are (report, page, table, measure, expression, used_in) tuples, in order of first occurrence.
+    """
+    report_name = extract_report_name(json_file_path)
+    page_name = extract_page_name(json_file_path) or "NA"
+    # Dicts serve as insertion-ordered sets, so duplicates are dropped as they are traversed
+    usage_rows = {}
+    measure_rows = {}
+    try:
+        data = load_json_file(json_file_path)
+        for table, column, used_in, expression in traverse_pbir_json_structure(data):
+            if expression is not None:
+                measure_rows[(report_name, page_name, table, column, expression, used_in)] = None
             else:
-                yield from traverse_pbir_json_structure(value, context)
-    elif isinstance(data, list):
-        for item in data:
-            yield from traverse_pbir_json_structure(item, context)
+                usage_rows[(report_name, page_name, table, column, used_in)] = None
+    except (ValueError, IOError) as e:
+        print(f"Error: Unable to process file {json_file_path}: {str(e)}")
+    return list(usage_rows), list(measure_rows)
 
 
-def extract_pbir_component_metadata(directory_path):
+def iter_pbir_component_metadata(directory_path, max_workers=None):
+    """
+    Yields the unique metadata rows of all Power BI Enhanced Report Format (PBIR) component files in the specified directory.
+
+    Usage rows are yielded first, each with the expression of the matching measure (if any), followed by the
+    measures that are not used anywhere in the report.
+
+    Args:
+        directory_path (str): The root directory path containing PBIR component JSON files.
+        max_workers (int, optional): Number of worker processes used to read files (defaults to the CPU count,
+            1 runs sequentially).
+
+    Yields:
+        tuple: (report, page, table, column or measure, expression, used in)
+    """
+    # Page names may have changed since a previous run in the same process
+    extract_page_display_name.cache_clear()
+
+    # Rows are kept in dicts as insertion-ordered sets, so duplicates across files are never stored;
+    # usage rows can only be written once every measure expression is known
+    usage_rows = {}
+    measure_rows = {}
+    for file_usage_rows, file_measure_rows in map_json_files(extract_pbir_file_metadata, find_json_files(directory_path), max_workers):
+        usage_rows.update(dict.fromkeys(file_usage_rows))
+        measure_rows.update(dict.fromkeys(file_measure_rows))
+
+    expression_by_key = {}
+    for report, _, table, measure, expression, _ in measure_rows:
+        expression_by_key.setdefault((report, table, measure), expression)
+
+    used_keys = set()
+    for report, page, table, column, used_in in usage_rows:
+        key = (report, table, column)
+        used_keys.add(key)
+        yield (report, page, table, column, expression_by_key.get(key), used_in)
+
+    # Ensure measures that were not used anywhere are included as well
+    for row in measure_rows:
+        if (row[0], row[2], row[3]) not in used_keys:
+            yield row
+
+
+def extract_pbir_component_metadata(directory_path, max_workers=None):
     """
     Extracts detailed metadata from all Power BI Enhanced Report Format (PBIR) component files in the specified directory.
 
@@ -366,74 +950,17 @@ def extract_pbir_component_metadata(directory_path):
 
     Args:
         directory_path (str): The root directory path containing PBIR component JSON files.
+        max_workers (int, optional): Number of worker processes used to read files (defaults to the CPU count,
+            1 runs sequentially).
 
     Returns:
         list: A list of dictionaries, each representing a unique metadata entry with fields:
             Report, Page, Table, Column or Measure, Expression, and Used In.
     """
+    return [dict(zip(METADATA_FIELDNAMES, row)) for row in iter_pbir_component_metadata(directory_path, max_workers)]
+
 
-    # Extract data from all json files in a directory
-    all_rows = []
-    for root, _, files in os.walk(directory_path):
-        for file in files:
-            if file.endswith('.json'):
-                json_file_path = os.path.join(root, file)
-                report_name = extract_report_name(json_file_path)
-                page_name = extract_page_name(json_file_path) or "NA"
-                try:
-                    with open(json_file_path, 'r', encoding='utf-8') as file:
-                        data = json.load(file)
-                        for table, column, used_in, expression in traverse_pbir_json_structure(data):
-                            all_rows.append({"Report": report_name, "Page": page_name, "Table": table, "Column or Measure": column, "Expression": expression, "Used In": used_in})
-                except (json.JSONDecodeError, IOError) as e:
-                    print(f"Error: Unable to process file {json_file_path}: {str(e)}")
-
-    # Separate rows based on whether they have an "expression" value
-    rows_with_expression = [row for row in all_rows if row['Expression'] is not None]
-    rows_without_expression = [row for row in all_rows if row['Expression'] is None]
-
-    # This step is done to ensure we get table and respective column in single row
-    reformatted_rows = [
-        {
-            "Report": rows_without_expression[i]["Report"],
-            "Page": rows_without_expression[i]["Page"],
-            "Table": rows_without_expression[i]["Table"],
-            "Column or Measure": rows_without_expression[i + 1]["Column or Measure"],
-            "Expression": None,
-            "Used In": rows_without_expression[i]["Used In"]
-        }
-        for i in range(0, len(rows_without_expression), 2)
-        if i + 1 < len(rows_without_expression)
-    ]
-
-    # This step ensures we add expression to the reformatted_rows based on a join to rows_with_expression
-    for row_without in reformatted_rows:
-        for row_with in rows_with_expression:
-            if (row_without['Report'] == row_with['Report'] and
-                row_without['Table'] == row_with['Table'] and
-                row_without['Column or Measure'] == row_with['Column or Measure']):
-                row_without['Expression'] = row_with['Expression']
-                break  # Stop looking once a match is found
-
-    # Ensure rows_with_expression that were not used anywhere are added to reformatted_rows
-    final_rows = reformatted_rows + [row for row in rows_with_expression if not any(
-        row['Report'] == r['Report'] and
-        row['Table'] == r['Table'] and
-        row['Column or Measure'] == r['Column or Measure'] for r in reformatted_rows)]
-    
-    # Extract distinct rows
-    unique_rows = []
-    seen = set()
-    for row in final_rows:
-        row_tuple = (row['Report'], row['Page'], row['Table'], row['Column or Measure'], row['Expression'], row['Used In'])
-        if row_tuple not in seen:
-            unique_rows.append(row)
-            seen.add(row_tuple)
-    
-    return unique_rows
-
-
-def export_pbir_metadata_to_csv(directory_path, csv_output_path):
+def export_pbir_metadata_to_csv(directory_path, csv_output_path, max_workers=None):
     """
     Exports the extracted Power BI Enhanced Report Format (PBIR) metadata to a CSV file.
 
@@ -445,6 +972,8 @@ def export_pbir_metadata_to_csv(directory_path, csv_output_path):
     Args:
         directory_path (str): The directory path containing PBIR JSON files.
         csv_output_path (str): The output path for the CSV file containing the extracted metadata.
+        max_workers (int, optional): Number of worker processes used to read files (defaults to the CPU count,
+            1 runs sequentially).
 
     Returns:
         None
@@ -458,9 +987,9 @@ def export_pbir_metadata_to_csv(directory_path, csv_output_path):
     - Used In: Context where the item is used (e.g., visual, Drillthrough, Filters, Bookmarks)
     """
     
-    metadata = extract_pbir_component_metadata(directory_path)
-    fieldnames = ['Report', 'Page', 'Table', 'Column or Measure', 'Expression', 'Used In']
+    # Collect all rows before opening the output, so a failed extraction leaves an existing export intact
+    rows = list(iter_pbir_component_metadata(directory_path, max_workers))
     with open(csv_output_path, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(metadata)
+        writer = csv.writer(csvfile)
+        writer.writerow(METADATA_FIELDNAMES)
+        writer.writerows(rows)